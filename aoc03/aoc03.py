@@ -1,24 +1,54 @@
-import numpy as np
+# splitting the lines is as fast as unpickling them
+CACHE = False
+
+PHASES = {
+    "parse": ["parse"],
+    "build": ["to_matrix"],
+    "solve": ["power_py", "power_np", "life_support_py", "life_support_np"],
+}
 
 
 def to_chars(line):
     return [char for char in line]
 
 
+def to_matrix(rows):
+    import numpy as np
+
+    return np.asarray(list(map(to_chars, rows)), dtype=int)
+
+
 def complement(bin_str):
     return "".join(["0" if char == "1" else "1" for char in bin_str])
 
 
-def part_one(matrix):
-    col_sums = np.sum(matrix, axis=0)
-    threshold = matrix.shape[0] // 2
-    gamma_str = "".join(["1" if col_sum >= threshold else "0" for col_sum in col_sums])
+def power(gamma_str):
     gamma = int(gamma_str, 2)
     epsilon = int(complement(gamma_str), 2)
-    print(f"power: {gamma * epsilon}")
+    return gamma * epsilon
+
+
+def power_np(matrix):
+    import numpy as np
+
+    col_sums = np.sum(matrix, axis=0)
+    threshold = matrix.shape[0] // 2
+    return power(
+        "".join(["1" if col_sum >= threshold else "0" for col_sum in col_sums])
+    )
+
+
+def power_py(rows):
+    threshold = len(rows) // 2
+    col_sums = [column.count("1") for column in zip(*rows)]
+    return power(
+        "".join(["1" if col_sum >= threshold else "0" for col_sum in col_sums])
+    )
 
 
 def recursive(x, pos=0, condition=None):
+    import numpy as np
+
     def get_line_idxs(value):
         return np.asarray([i for i in range(x.shape[0]) if x[i, pos] == value])
 
@@ -33,6 +63,17 @@ def recursive(x, pos=0, condition=None):
     return recursive(x[line_idxs, :], pos + 1, condition)
 
 
+def recursive_py(rows, pos=0, condition=None):
+    if not rows:
+        raise ValueError("No row is left that matches the bit criteria.")
+    if len(rows) == 1:
+        return rows[0]
+    value = sum([1 for row in rows if row[pos] == "1"])
+    threshold = len(rows) / 2
+    bit = "1" if condition(value, threshold) else "0"
+    return recursive_py([row for row in rows if row[pos] == bit], pos + 1, condition)
+
+
 def condition_oxygen(value, threshold):
     return value >= threshold
 
@@ -41,16 +82,49 @@ def condition_co2(value, threshold):
     return value < threshold
 
 
-def part_two(matrix):
+def life_support_np(matrix):
     oxygen = int(recursive(matrix, condition=condition_oxygen), 2)
     co2 = int(recursive(matrix, condition=condition_co2), 2)
-    print(f"life support: {oxygen*co2}")
+    return oxygen * co2
+
+
+def life_support_py(rows):
+    oxygen = int(recursive_py(rows, condition=condition_oxygen), 2)
+    co2 = int(recursive_py(rows, condition=condition_co2), 2)
+    return oxygen * co2
+
+
+# The string based engine beats numpy even on 50000 rows, since building the
+# matrix costs more than the solve. numpy is only imported for engine="numpy".
+ENGINES = ["python", "numpy"]
+
+
+def part_one(rows, engine="python"):
+    if engine == "numpy":
+        return power_np(to_matrix(rows))
+    return power_py(rows)
+
+
+def part_two(rows, engine="python"):
+    if engine == "numpy":
+        return life_support_np(to_matrix(rows))
+    return life_support_py(rows)
+
+
+def parse(data):
+    return data.split()
+
+
+def load_data(filename):
+    with open(filename) as fd:
+        return parse(fd.read())
+
 
+def main():
+    rows = load_data("data.txt")
+    print(f"power: {part_one(rows)}")
+    print(f"life support: {part_two(rows)}")
 
-with open("data.txt") as fd:
-    data = fd.read()
 
-x = list(map(to_chars, data.split()))
-matrix = np.asarray(x, dtype=int)
-part_one(matrix)
-part_two(matrix)
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
-import numpy as np
+from __future__ import annotations
+
+PHASES = {
+    "parse": ["parse"],
+    "build": ["Field.__init__", "FieldNp.__init__"],
+    "solve": ["get_winner"],
+}
 
 
 class Draws:
@@ -25,7 +31,65 @@ class Draws:
 
 
 class Field:
+    """A board that counts the marked numbers of every row and column."""
+
+    def __init__(self, data: list[list[int]]):
+        self._data = data
+        self._active = [[-1] * len(row) for row in data]
+        self._positions = {
+            value: (row_idx, column_idx)
+            for row_idx, row in enumerate(data)
+            for column_idx, value in enumerate(row)
+        }
+        self._row_hits = [0] * len(data)
+        self._column_hits = [0] * len(data[0])
+        self._has_won = False
+        self._total = sum([sum(row) for row in data])
+        self._marked_sum = 0
+        self._unmarked = len(self._positions)
+
+    def __repr__(self):
+        format_string = " ".join(5 * ["{:>2}"])
+        lines = [format_string.format(*line) for line in self._data]
+        return "\n".join(lines)
+
+    @property
+    def marked_fields(self) -> str:
+        format_string = " ".join(5 * ["{:>2}"])
+        lines = [format_string.format(*line) for line in self._active]
+        return "\n".join(lines).replace("-1", " .")
+
+    def mark(self, value: int) -> None:
+        try:
+            row_idx, column_idx = self._positions[value]
+        except KeyError:
+            return
+        if self._active[row_idx][column_idx] != -1:
+            return
+        self._active[row_idx][column_idx] = value
+        self._marked_sum += value
+        self._unmarked -= 1
+        self._row_hits[row_idx] += 1
+        self._column_hits[column_idx] += 1
+        if self._row_hits[row_idx] == len(self._column_hits) or self._column_hits[
+            column_idx
+        ] == len(self._row_hits):
+            self._has_won = True
+
+    @property
+    def has_won(self) -> bool:
+        return self._has_won
+
+    @property
+    def board_sum(self) -> int:
+        # same as FieldNp, where unmarked fields count as -1 in _active
+        return self._total - (self._marked_sum - self._unmarked)
+
+
+class FieldNp:
     def __init__(self, data: list[list[int]]):
+        import numpy as np
+
         self._data = np.asarray(data)
         self._active = -np.ones_like(self._data, dtype=int)
 
@@ -41,11 +105,10 @@ class Field:
         return "\n".join(lines).replace("-1", " .")
 
     def mark(self, value: int) -> None:
-        try:
-            idxs = np.argwhere(self._data == value)[0]
-        except IndexError:
+        rows, columns = (self._data == value).nonzero()
+        if not len(rows):
             return
-        self._active[idxs[0], idxs[1]] = value
+        self._active[rows[0], columns[0]] = value
 
     @property
     def has_won(self) -> bool:
@@ -59,26 +122,31 @@ class Field:
 
     @property
     def board_sum(self) -> int:
-        return np.sum(self._data) - np.sum(self._active)
+        return self._data.sum() - self._active.sum()
 
 
-def load_data(filename):
+ENGINES = {"python": Field, "numpy": FieldNp}
+
+
+def parse(data: str, engine: str = "python") -> tuple[Draws, list[Field]]:
     fields = []
+    lines = iter(data.splitlines())
+    draws = [int(item) for item in next(lines).strip().split(",")]
+    for _ in lines:
+        field = []
+        for _ in range(5):
+            field.append(
+                [int(item) for item in next(lines).strip().split(" ") if item != ""]
+            )
+        fields.append(field)
+
+    field_class = ENGINES[engine]
+    return Draws(draws), [field_class(field) for field in fields]
+
+
+def load_data(filename, engine: str = "python"):
     with open(filename) as fd:
-        draws = [int(item) for item in fd.readline().strip().split(",")]
-        while _ := fd.readline():
-            lines = []
-            for _ in range(5):
-                lines.append(
-                    [
-                        int(item)
-                        for item in fd.readline().strip().split(" ")
-                        if item != ""
-                    ]
-                )
-            fields.append(lines)
-
-    return Draws(draws), [Field(field) for field in fields]
+        return parse(fd.read(), engine)
 
 
 def get_winner(draws, fields):
@@ -108,5 +176,15 @@ def iterate(draws, fields):
         input()
 
 
-draws, fields = load_data("testdata.txt")
-print(get_winner(draws, fields))
+def part_two(data: tuple[Draws, list[Field]]) -> int:
+    draws, fields = data
+    return get_winner(draws, fields)
+
+
+def main():
+    draws, fields = load_data("testdata.txt")
+    print(get_winner(draws, fields))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-import numpy as np
+from collections import Counter
+
+# above this many lines, filling the numpy grid beats counting fields in a dict
+VECTORISE_ABOVE = 2000
+ENGINES = ["python", "numpy"]
+
+PHASES = {
+    "parse": ["parse"],
+    "build": ["Grid.from_lines", "VentMap.from_lines"],
+    "solve": ["count_overlaps", "count_overlaps_np"],
+}
 
 
 class Grid:
@@ -14,6 +24,8 @@ class Grid:
         return instance
 
     def __init__(self, x=1000, y=1000):
+        import numpy as np
+
         self.grid = np.zeros((x, y), dtype=int)
 
 
@@ -70,14 +82,140 @@ class Line:
         return self.spanning_fields_parallel
 
 
+class VentMap:
+    """Lines that can be added and removed, with the overlaps counted in a
+    2D Fenwick tree."""
+
+    def __init__(self, x=1000, y=1000):
+        self.x = x
+        self.y = y
+        self.coverage: Counter[tuple[int, int]] = Counter()
+        self.overlaps = 0
+        self._lines: Counter[tuple[int, int, int, int]] = Counter()
+        self._tree = [[0] * (y + 1) for _ in range(x + 1)]
+
+    @classmethod
+    def from_lines(cls, lines: list[Line], x=1000, y=1000) -> VentMap:
+        instance = VentMap(x, y)
+        for line in lines:
+            instance.add(line)
+        return instance
+
+    def add(self, line: Line) -> None:
+        if not (
+            0 <= min(line.x1, line.x2)
+            and max(line.x1, line.x2) < self.x
+            and 0 <= min(line.y1, line.y2)
+            and max(line.y1, line.y2) < self.y
+        ):
+            raise ValueError(f"Line {self._key(line)} is outside of the map.")
+        self._lines[self._key(line)] += 1
+        for field in line.spanning_fields:
+            self._cover(field, 1)
+
+    def remove(self, line: Line) -> None:
+        key = self._key(line)
+        if not self._lines[key]:
+            raise ValueError(f"Line {key} is not on the map.")
+        self._lines[key] -= 1
+        for field in line.spanning_fields:
+            self._cover(field, -1)
+
+    def count_overlaps(self, x1: int, y1: int, x2: int, y2: int) -> int:
+        """Number of overlaps in the rectangle, corners included."""
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        x1, x2 = max(x1, 0), min(x2, self.x - 1)
+        y1, y2 = max(y1, 0), min(y2, self.y - 1)
+        if x1 > x2 or y1 > y2:
+            return 0
+        return (
+            self._prefix(x2 + 1, y2 + 1)
+            - self._prefix(x1, y2 + 1)
+            - self._prefix(x2 + 1, y1)
+            + self._prefix(x1, y1)
+        )
+
+    @staticmethod
+    def _key(line: Line) -> tuple[int, int, int, int]:
+        return line.x1, line.y1, line.x2, line.y2
+
+    def _cover(self, field: tuple[int, int], change: int) -> None:
+        before = self.coverage[field]
+        after = before + change
+        if after:
+            self.coverage[field] = after
+        else:
+            del self.coverage[field]
+        if before < 2 <= after:
+            self._mark(field, 1)
+        elif after < 2 <= before:
+            self._mark(field, -1)
+
+    def _mark(self, field: tuple[int, int], change: int) -> None:
+        self.overlaps += change
+        i = field[0] + 1
+        while i <= self.x:
+            row = self._tree[i]
+            j = field[1] + 1
+            while j <= self.y:
+                row[j] += change
+                j += j & -j
+            i += i & -i
+
+    def _prefix(self, x: int, y: int) -> int:
+        """Overlaps in the fields left of x and above y."""
+        result = 0
+        i = x
+        while i > 0:
+            row = self._tree[i]
+            j = y
+            while j > 0:
+                result += row[j]
+                j -= j & -j
+            i -= i & -i
+        return result
+
+
+def parse(data: str) -> list[Line]:
+    return [Line.from_str(line) for line in data.splitlines() if line.strip()]
+
+
 def read_data(filename: str) -> list[Line]:
     with open(filename) as fd:
-        lines = fd.readlines()
-    return [Line.from_str(line) for line in lines]
+        return parse(fd.read())
+
+
+def count_overlaps(lines: list[Line]) -> int:
+    coverage = Counter(field for line in lines for field in line.spanning_fields)
+    return sum([1 for count in coverage.values() if count > 1])
+
+
+def count_overlaps_np(lines: list[Line]) -> int:
+    import numpy as np
+
+    grid = Grid.from_lines(lines)
+    idxs = np.argwhere(grid.grid > 1)
+    return len(idxs)
+
+
+def part_two(lines: list[Line], engine: str | None = None) -> int:
+    if engine is None:
+        engine = "numpy" if len(lines) > VECTORISE_ABOVE else "python"
+    if engine == "numpy":
+        return count_overlaps_np(lines)
+    return count_overlaps(lines)
+
+
+def main():
+    import numpy as np
+
+    lines = read_data("data.txt")
+    grid = Grid.from_lines(lines)
+    idxs = np.argwhere(grid.grid > 1)
+    print(len(idxs))
+    print(grid.grid.T)
 
 
-lines = read_data("data.txt")
-grid = Grid.from_lines(lines)
-idxs = np.argwhere(grid.grid > 1)
-print(len(idxs))
-print(grid.grid.T)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import random
+from collections import Counter
+
+import pytest
+from aoc05 import Line, VentMap, count_overlaps
+
+
+def brute_force(lines: list[Line], x1: int, y1: int, x2: int, y2: int) -> int:
+    coverage = Counter(field for line in lines for field in line.spanning_fields)
+    return sum(
+        [
+            1
+            for (x, y), count in coverage.items()
+            if count > 1 and x1 <= x <= x2 and y1 <= y <= y2
+        ]
+    )
+
+
+class TestVentMap:
+    def test_add_and_remove(self):
+        rng = random.Random(0)
+        lines = []
+        for _ in range(60):
+            x1, y1 = rng.randrange(50), rng.randrange(50)
+            if rng.random() < 0.5:
+                lines.append(Line(x1, y1, x1, rng.randrange(50)))
+            else:
+                lines.append(Line(x1, y1, rng.randrange(50), y1))
+        vents = VentMap.from_lines(lines, 50, 50)
+        assert vents.overlaps == count_overlaps(lines)
+
+        for line in lines[:30]:
+            vents.remove(line)
+        rest = lines[30:]
+        assert vents.overlaps == count_overlaps(rest)
+        assert vents.count_overlaps(0, 0, 49, 49) == vents.overlaps
+
+        for _ in range(50):
+            x1, x2 = rng.randrange(50), rng.randrange(50)
+            y1, y2 = rng.randrange(50), rng.randrange(50)
+            expected = brute_force(
+                rest, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+            )
+            assert vents.count_overlaps(x1, y1, x2, y2) == expected
+
+    def test_remove_missing_line(self):
+        vents = VentMap(10, 10)
+        with pytest.raises(ValueError):
+            vents.remove(Line(0, 0, 0, 5))
+
+    def test_rectangles_outside_of_the_map(self):
+        vents = VentMap(10, 10)
+        vents.add(Line(0, 0, 0, 5))
+        vents.add(Line(0, 0, 0, 5))
+        assert vents.overlaps == 6
+        assert vents.count_overlaps(-5, 0, -3, 10) == 0
+        assert vents.count_overlaps(15, 0, 16, 9) == 0
+        assert vents.count_overlaps(-5, -5, 20, 20) == 6
+        assert vents.count_overlaps(20, 3, -20, -20) == 4
+
+    def test_line_outside_of_the_map(self):
+        vents = VentMap(10, 10)
+        with pytest.raises(ValueError):
+            vents.add(Line(10, 0, 10, 5))
+        assert vents.overlaps == 0
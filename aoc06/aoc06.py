@@ -1,12 +1,24 @@
-import numpy as np
-import numpy.typing as npt
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
 
 SIZE = 1000000000
 
+PHASES = {
+    "parse": ["parse"],
+    "solve": ["iterate", "iterate_np"],
+}
+
 
 def iterate_np(
     generation: npt.NDArray[int], fish_count: int, number_generations: int
 ) -> npt.NDArray:
+    # the default list based path must not pay for importing numpy
+    import numpy as np
+
     for iteration in range(number_generations):
         print(iteration, fish_count)
         next_generation = np.zeros(SIZE, dtype=np.int8)
@@ -45,10 +57,23 @@ def iterate(generation: list[int], limit: int = 1) -> list[int]:
     return generation
 
 
-with open("testdata.txt") as fd:
-    data = fd.read()
+def parse(data: str) -> list[int]:
+    return [int(value) for value in data.split(",")]
+
+
+def part_one(generation: list[int]) -> int:
+    return len(iterate(generation, 80))
+
+
+def main():
+    with open("testdata.txt") as fd:
+        data = fd.read()
+
+    generation = parse(data)
+    # result = iterate_np(np.asarray(generation, dtype=np.int8), len(generation), 256)
+    result = iterate(generation, 256)
+    print(len(result))
+
 
-data = np.asarray([int(value) for value in data.split(",")], dtype=np.int8)
-# result = iterate_np(data, len(data), 256)
-result = iterate(list(data), 256)
-print(len(result))
+if __name__ == "__main__":
+    main()
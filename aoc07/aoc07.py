@@ -2,10 +2,16 @@ from __future__ import annotations
 
 from functools import cache
 
+import math
 import sys
 
 sys.setrecursionlimit(3000)
 
+PHASES = {
+    "parse": ["parse"],
+    "solve": ["optimise", "optimise2"],
+}
+
 
 def element_sub(array: list[int], value: int) -> list[int]:
     return [element - value for element in array]
@@ -32,7 +38,7 @@ def sum_recursive(number: int) -> int:
     return number + sum_recursive(number - 1)
 
 
-def optimise(positions: list[int]) -> None:
+def optimise(positions: list[int]) -> tuple[int, int]:
     positions_to_check = list(range(min(positions), max(positions) + 1))
     fuel_array = len(positions_to_check) * [0]
 
@@ -42,12 +48,10 @@ def optimise(positions: list[int]) -> None:
     optimum_idx = [
         idx for idx in range(len(positions_to_check)) if fuel_array[idx] == minimum
     ][0]
-    print(
-        f"Position: {positions_to_check[optimum_idx]}, Fuel: {fuel_array[optimum_idx]}"
-    )
+    return positions_to_check[optimum_idx], fuel_array[optimum_idx]
 
 
-def optimise2(positions: list[int]) -> None:
+def optimise2(positions: list[int]) -> tuple[int, int]:
     positions_to_check = list(range(min(positions), max(positions) + 1))
     fuel_array = len(positions_to_check) * [0]
 
@@ -57,17 +61,146 @@ def optimise2(positions: list[int]) -> None:
     optimum_idx = [
         idx for idx in range(len(positions_to_check)) if fuel_array[idx] == minimum
     ][0]
-    print(
-        f"Position: {positions_to_check[optimum_idx]}, Fuel: {fuel_array[optimum_idx]}"
-    )
+    return positions_to_check[optimum_idx], fuel_array[optimum_idx]
+
+
+def parse(content: str) -> list[int]:
+    return [int(item) for item in content.split(",")]
+
+
+class FenwickTree:
+    """Prefix sums over the indices 0 to size - 1, updated in O(log size)."""
+
+    def __init__(self, size: int = 1):
+        self.values: list[int] = []
+        self.tree: list[int] = [0]
+        self.grow(size)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def grow(self, size: int) -> None:
+        self.values.extend([0] * (size - len(self.values)))
+        self.tree = [0] * (size + 1)
+        for index, value in enumerate(self.values, 1):
+            self.tree[index] += value
+            parent = index + (index & -index)
+            if parent <= size:
+                self.tree[parent] += self.tree[index]
+
+    def add(self, index: int, value: int) -> None:
+        self.values[index] += value
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += value
+            index += index & -index
+
+    def prefix_sum(self, end: int) -> int:
+        """Sum of the values at the indices below ``end``."""
+        result = 0
+        end = min(end, len(self))
+        while end > 0:
+            result += self.tree[end]
+            end -= end & -end
+        return result
+
+    def search(self, target: int) -> int:
+        """Smallest index whose prefix sum, itself included, exceeds ``target``."""
+        index = 0
+        step = 1 << (len(self).bit_length() - 1)
+        while step:
+            if index + step <= len(self) and self.tree[index + step] <= target:
+                index += step
+                target -= self.tree[index]
+            step //= 2
+        return index
+
+
+class CrabStream:
+    """Crab positions that come and go, with the same answers as ``optimise``
+    and ``optimise2``."""
+
+    def __init__(self, positions: list[int] | None = None):
+        self._counts = FenwickTree()
+        self._sums = FenwickTree()
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        for position in positions or []:
+            self.add(position)
+
+    def add(self, position: int) -> None:
+        assert position >= 0
+        if position >= len(self._counts):
+            size = max(2 * len(self._counts), position + 1)
+            self._counts.grow(size)
+            self._sums.grow(size)
+        self._update(position, 1)
+
+    def remove(self, position: int) -> None:
+        if not 0 <= position < len(self._counts) or not self._counts.values[position]:
+            raise ValueError(f"There is no crab at position {position}.")
+        self._update(position, -1)
+
+    def _update(self, position: int, sign: int) -> None:
+        self._counts.add(position, sign)
+        self._sums.add(position, sign * position)
+        self.count += sign
+        self.total += sign * position
+        self.total_squares += sign * position * position
+
+    def fuel(self, center: int) -> int:
+        below = self._counts.prefix_sum(center + 1)
+        below_sum = self._sums.prefix_sum(center + 1)
+        above = self.count - below
+        above_sum = self.total - below_sum
+        return center * below - below_sum + above_sum - center * above
+
+    def fuel2(self, center: int) -> int:
+        # sum_recursive(d) == (d * d + d) / 2
+        squares = (
+            self.total_squares - 2 * center * self.total + self.count * center * center
+        )
+        return (squares + self.fuel(center)) // 2
+
+    def optimise(self) -> tuple[int, int]:
+        if not self.count:
+            raise ValueError("There are no crabs.")
+        # the lower median is the smallest center with minimum fuel
+        center = self._counts.search((self.count - 1) // 2)
+        return center, self.fuel(center)
+
+    def optimise2(self) -> tuple[int, int]:
+        if not self.count:
+            raise ValueError("There are no crabs.")
+        # the real optimum lies within half a step of the mean
+        mean = self.total / self.count
+        centers = range(max(math.floor(mean - 0.5), 0), math.ceil(mean + 0.5) + 1)
+        return min(
+            [(center, self.fuel2(center)) for center in centers],
+            key=lambda item: item[1],
+        )
 
 
 def loadfile(filename: str) -> list[int]:
     with open(filename) as fd:
         content = fd.read()
-    return [int(item) for item in content.split(",")]
+    return parse(content)
+
+
+def part_one(positions: list[int]) -> tuple[int, int]:
+    return optimise(positions)
+
+
+def part_two(positions: list[int]) -> tuple[int, int]:
+    return optimise2(positions)
+
+
+def main():
+    positions = loadfile("data.txt")
+    print("Position: {}, Fuel: {}".format(*optimise(positions)))
+    print("Position: {}, Fuel: {}".format(*optimise2(positions)))
 
 
-positions = loadfile("data.txt")
-optimise(positions)
-optimise2(positions)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+from aoc07 import CrabStream, FenwickTree, optimise, optimise2
+
+EXAMPLE = [16, 1, 2, 0, 4, 2, 7, 1, 2, 14]
+
+
+class TestFenwickTree:
+    def test_prefix_sum_and_search(self):
+        rng = random.Random(0)
+        tree = FenwickTree(3)
+        values = [0] * 3
+        for _ in range(200):
+            index = rng.randrange(40)
+            if index >= len(tree):
+                tree.grow(index + 1)
+                values.extend([0] * (index + 1 - len(values)))
+            value = rng.randint(0, 5)
+            tree.add(index, value)
+            values[index] += value
+            end = rng.randrange(len(values) + 2)
+            assert tree.prefix_sum(end) == sum(values[:end])
+            target = rng.randrange(sum(values) + 1)
+            expected = next(
+                (i for i in range(len(values)) if sum(values[: i + 1]) > target),
+                len(values),
+            )
+            assert tree.search(target) == expected
+
+
+class TestCrabStream:
+    def test_example(self):
+        stream = CrabStream(EXAMPLE)
+        assert stream.optimise() == (2, 37)
+        assert stream.optimise2() == (5, 168)
+
+    def test_add_and_remove(self):
+        rng = random.Random(0)
+        positions = []
+        stream = CrabStream()
+        for _ in range(300):
+            if positions and rng.random() < 0.4:
+                position = positions.pop(rng.randrange(len(positions)))
+                stream.remove(position)
+            else:
+                position = rng.randint(0, 200)
+                positions.append(position)
+                stream.add(position)
+            if positions:
+                assert stream.optimise() == optimise(positions)
+                assert stream.optimise2() == optimise2(positions)
+
+    def test_remove_missing_position(self):
+        stream = CrabStream([3, 5])
+        with pytest.raises(ValueError):
+            stream.remove(4)
+        with pytest.raises(ValueError):
+            stream.remove(100)
+        stream.remove(3)
+        with pytest.raises(ValueError):
+            stream.remove(3)
+        assert stream.optimise() == (5, 0)
+
+    def test_empty_stream(self):
+        stream = CrabStream([7])
+        stream.remove(7)
+        with pytest.raises(ValueError):
+            stream.optimise()
+        with pytest.raises(ValueError):
+            CrabStream().optimise2()
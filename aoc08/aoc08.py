@@ -4,6 +4,15 @@ from enum import Enum
 
 A_THROUGH_G: list[str] = [chr(91 + i) for i in range(7)]
 
+# unpickling the patterns takes longer than parsing them
+CACHE = False
+
+PHASES = {
+    "parse": ["parse"],
+    "build": ["Pattern.__init__"],
+    "solve": ["Decoder.count_digits_appear_in_string"],
+}
+
 
 class Pattern:
     def __init__(self, string: str):
@@ -100,7 +109,25 @@ def extract_patterns(content: str) -> tuple[list[Pattern], list[Pattern]]:
     return patterns, output_patterns
 
 
-with open("data.txt") as fd:
-    while content := fd.readline().strip():
-        patterns, output_patterns = extract_patterns(content)
-        decoder = Decoder.from_patterns(patterns)
+def parse(data: str) -> list[tuple[list[Pattern], list[Pattern]]]:
+    return [
+        extract_patterns(line.strip()) for line in data.splitlines() if line.strip()
+    ]
+
+
+def part_one(entries: list[tuple[list[Pattern], list[Pattern]]]) -> int:
+    return sum(
+        Decoder.count_digits_appear_in_string(output_patterns)
+        for _, output_patterns in entries
+    )
+
+
+def main():
+    with open("data.txt") as fd:
+        while content := fd.readline().strip():
+            patterns, output_patterns = extract_patterns(content)
+            decoder = Decoder.from_patterns(patterns)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from functools import cache
+
+PHASES = {
+    "parse": ["parse"],
+    "build": ["CaveSystem.__init__"],
+    "solve": ["CaveSystem.count_paths"],
+}
+
+
+class CaveSystem:
+    """Caves interned to integer ids, with adjacency lists."""
+
+    def __init__(self, names: list[str], connections: list[tuple[int, int]]):
+        self.names = names
+        self.start = names.index("start")
+        self.end = names.index("end")
+        self.neighbours: list[list[int]] = [[] for _ in names]
+        # a connection listed twice, in either direction, is still one
+        unique = dict.fromkeys(tuple(sorted(pair)) for pair in connections)
+        for cave1, cave2 in unique:
+            if self.is_large(cave1) and self.is_large(cave2):
+                raise ValueError(
+                    f"Large caves {names[cave1]} and {names[cave2]} are connected, "
+                    "the number of paths is infinite."
+                )
+            self.neighbours[cave1].append(cave2)
+            self.neighbours[cave2].append(cave1)
+        # large caves may be visited any number of times and get no bit
+        self.bits = [
+            0 if self.is_large(cave) else 1 << cave for cave in range(len(names))
+        ]
+
+    def is_large(self, cave: int) -> bool:
+        return self.names[cave].isupper()
+
+    @classmethod
+    def from_str(cls, content: str) -> CaveSystem:
+        ids: dict[str, int] = {}
+        connections = []
+        for line in content.split():
+            name1, name2 = line.split("-")
+            cave1 = ids.setdefault(name1, len(ids))
+            cave2 = ids.setdefault(name2, len(ids))
+            connections.append((cave1, cave2))
+        return cls(list(ids), connections)
+
+    @classmethod
+    def from_file(cls, filename) -> CaveSystem:
+        with open(filename) as fd:
+            return cls.from_str(fd.read())
+
+    def count_paths(self, allow_revisit: bool = False) -> int:
+        """Number of paths from start to end, optionally visiting one small cave
+        twice."""
+
+        @cache
+        def count(cave: int, visited: int, revisited: bool) -> int:
+            if cave == self.end:
+                return 1
+            paths = 0
+            for neighbour in self.neighbours[cave]:
+                if neighbour == self.start:
+                    continue
+                bit = self.bits[neighbour]
+                if not visited & bit:
+                    paths += count(neighbour, visited | bit, revisited)
+                elif not revisited:
+                    paths += count(neighbour, visited, True)
+            return paths
+
+        return count(self.start, self.bits[self.start], not allow_revisit)
+
+
+def parse(content: str) -> CaveSystem:
+    return CaveSystem.from_str(content)
+
+
+def part_one(caves: CaveSystem) -> int:
+    return caves.count_paths()
+
+
+def part_two(caves: CaveSystem) -> int:
+    return caves.count_paths(allow_revisit=True)
+
+
+def main():
+    caves = CaveSystem.from_file("example.txt")
+    print(part_one(caves))
+    print(part_two(caves))
+
+
+if __name__ == "__main__":
+    main()
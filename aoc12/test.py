@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+from aoc12 import CaveSystem
+
+EXAMPLE = Path(__file__).with_name("example.txt")
+
+LARGER_EXAMPLE = """
+dc-end
+HN-start
+start-kj
+dc-start
+dc-HN
+LN-dc
+HN-end
+kj-sj
+kj-HN
+kj-dc
+"""
+
+EVEN_LARGER_EXAMPLE = """
+fs-end
+he-DX
+fs-he
+start-DX
+pj-DX
+end-zg
+zg-sl
+zg-pj
+pj-he
+RW-he
+fs-DX
+pj-RW
+zg-RW
+start-pj
+he-WI
+zg-he
+pj-fs
+start-RW
+"""
+
+
+class TestCaveSystem:
+    def test_example(self):
+        caves = CaveSystem.from_file(EXAMPLE)
+        assert caves.count_paths() == 10
+        assert caves.count_paths(allow_revisit=True) == 36
+
+    def test_larger_example(self):
+        caves = CaveSystem.from_str(LARGER_EXAMPLE)
+        assert caves.count_paths() == 19
+        assert caves.count_paths(allow_revisit=True) == 103
+
+    def test_even_larger_example(self):
+        caves = CaveSystem.from_str(EVEN_LARGER_EXAMPLE)
+        assert caves.count_paths() == 226
+        assert caves.count_paths(allow_revisit=True) == 3509
+
+    def test_repeated_connection(self):
+        content = EXAMPLE.read_text()
+        for line in ["start-A", "A-start"]:
+            caves = CaveSystem.from_str(content + "\n" + line)
+            assert caves.count_paths() == 10
+            assert caves.count_paths(allow_revisit=True) == 36
+
+    def test_connected_large_caves(self):
+        with pytest.raises(ValueError):
+            CaveSystem.from_str("start-A\nA-B\nB-end")
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
+import heapq
+import math
+import sys
 from functools import reduce, cached_property
 from typing import overload
 
-
 ADJACENT_INDICES = [-1, 0, 1]
 
+# unpickling the cells takes ten times as long as parsing them
+CACHE = False
+
+PHASES = {
+    "parse": ["Grid.from_str"],
+    "build": [
+        "AStar.__init__",
+        "Dial.__init__",
+        "Wavefront.__init__",
+        "LPAStar.__init__",
+    ],
+    "solve": ["AStar.solve", "Dial.solve", "Wavefront.solve", "LPAStar.solve"],
+}
+
 
 class Grid:
     def __init__(self, cells: list[Cell]):
@@ -26,15 +42,31 @@ class Grid:
         return Position(0, 0)
 
     def _get_cell_by_position(self, position: Position) -> Cell:
+        try:
+            return self._cells_by_position[position]
+        except KeyError:
+            raise IndexError("Cell not found.") from None
+
+    @cached_property
+    def _cells_by_position(self) -> dict[Position, Cell]:
+        return {cell.position: cell for cell in self.cells}
+
+    @cached_property
+    def risks(self) -> list[list[int]]:
+        """Risk of every cell, indexed by ``[x][y]``."""
+        rows = [[0] * (self.destination.y + 1) for _ in range(self.destination.x + 1)]
         for cell in self.cells:
-            if cell.position == position:
-                return cell
-        raise IndexError("Cell not found.")
+            rows[cell.position.x][cell.position.y] = cell.value
+        return rows
 
     @classmethod
     def from_file(cls, filename) -> Grid:
         with open(filename) as fd:
-            lines = fd.readlines()
+            return cls.from_str(fd.read())
+
+    @classmethod
+    def from_str(cls, content: str) -> Grid:
+        lines = content.splitlines()
         cells = [
             Cell(Position(line_idx, column_idx), int(digit))
             for line_idx, line in enumerate(lines)
@@ -126,7 +158,7 @@ class AStar:
         self._update_adjacent_positions(grid.start)
         self.graphs: list[Graph] = [Graph.from_grid(grid)]
 
-    def solve(self):
+    def solve(self) -> Graph:
         while True:
             cell = self.get_cell_with_minimum_distance_to_destination(
                 self.grid, self.adjacent_positions
@@ -136,7 +168,7 @@ class AStar:
             if cell.position == self.grid.destination:
                 break
             self._update_adjacent_positions(cell.position)
-        self._print_result()
+        return self._print_result()
 
     def _visit(self, cell: Cell):
         self.visited_positions.append(cell.position)
@@ -148,10 +180,12 @@ class AStar:
     ) -> Cell:
         print("evaluating metrics")
         return reduce(
-            lambda cell0, cell1: cell0
-            if cls._evaluate_possible_cell_with_metric(cell0, grid)
-            < cls._evaluate_possible_cell_with_metric(cell1, grid)
-            else cell1,
+            lambda cell0, cell1: (
+                cell0
+                if cls._evaluate_possible_cell_with_metric(cell0, grid)
+                < cls._evaluate_possible_cell_with_metric(cell1, grid)
+                else cell1
+            ),
             map(lambda position: grid[position], adjacent_positions),
         )
 
@@ -212,13 +246,370 @@ class AStar:
         minimum_risk_graph = min(suitable_graphs, key=lambda graph: graph.risk)
         minimum_risk_graph.append(cell)
 
-    def _print_result(self):
+    def _print_result(self) -> Graph:
         # list is guaranteed to be of length 1 (== only one graph holds the destination)
         graph = [graph for graph in self.graphs if self.grid.destination in graph][0]
         result = graph.combine_parts()
         print(result)
         print()
         print(result.pretty_repr)
+        return result
+
+
+class Dial:
+    """Shortest path search with a circular bucket queue (Dial's algorithm)."""
+
+    BUCKETS = 10
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.height = grid.destination.x + 1
+        self.width = grid.destination.y + 1
+        self.risks = [risk for row in grid.risks for risk in row]
+
+    def solve(self) -> Graph:
+        width, risks = self.width, self.risks
+        last_row = (self.height - 1) * width
+        target = len(risks) - 1
+        distances = [sys.maxsize] * len(risks)
+        previous = [-1] * len(risks)
+        buckets: list[list[int]] = [[] for _ in range(self.BUCKETS)]
+
+        distances[0] = 0
+        buckets[0].append(0)
+        pending = 1
+        cost = 0
+        while pending:
+            bucket = buckets[cost % self.BUCKETS]
+            while bucket:
+                index = bucket.pop()
+                pending -= 1
+                if distances[index] != cost:
+                    continue  # superseded by a cheaper entry
+                if index == target:
+                    return self._to_graph(previous)
+                column = index % width
+                neighbours = []
+                if index >= width:
+                    neighbours.append(index - width)
+                if index < last_row:
+                    neighbours.append(index + width)
+                if column > 0:
+                    neighbours.append(index - 1)
+                if column < width - 1:
+                    neighbours.append(index + 1)
+                for neighbour in neighbours:
+                    candidate = cost + risks[neighbour]
+                    if candidate < distances[neighbour]:
+                        distances[neighbour] = candidate
+                        previous[neighbour] = index
+                        buckets[candidate % self.BUCKETS].append(neighbour)
+                        pending += 1
+            cost += 1
+        raise ValueError("Destination is not reachable.")
+
+    def _to_graph(self, previous: list[int]) -> Graph:
+        indices = [len(previous) - 1]
+        while indices[-1] != 0:
+            indices.append(previous[indices[-1]])
+        positions = [divmod(index, self.width) for index in reversed(indices)]
+        return Graph.from_positions(self.grid, [Position(*pos) for pos in positions])
+
+
+class Wavefront:
+    """Shortest path by relaxing the whole cost field with numpy."""
+
+    def __init__(self, grid: Grid):
+        import numpy as np
+
+        self.grid = grid
+        self.risks = np.asarray(grid.risks, dtype=np.int64)
+
+    def solve(self) -> Graph:
+        costs = self.cost_field()
+        return Graph.from_positions(self.grid, self._trace_back(costs))
+
+    def cost_field(self):
+        import numpy as np
+
+        costs = np.full(self.risks.shape, np.iinfo(np.int64).max // 2)
+        costs[0, 0] = 0
+        self.relax(costs, self.risks)
+        return costs
+
+    @staticmethod
+    def relax(costs, risks):
+        """Lower the costs in place until no neighbour offers a cheaper way in."""
+        import numpy as np
+
+        forward = np.cumsum(risks, axis=1)
+        backward = np.cumsum(risks[:, ::-1], axis=1)[:, ::-1]
+        rows = costs.shape[0]
+        while True:
+            changed = False
+            for order in (range(rows), range(rows - 1, -1, -1)):
+                previous = None
+                for row in order:
+                    line = costs[row]
+                    relaxed = line if previous is None else previous + risks[row]
+                    relaxed = np.minimum(line, relaxed)
+                    # along the row, from the left and then from the right
+                    relaxed = (
+                        np.minimum.accumulate(relaxed - forward[row]) + forward[row]
+                    )
+                    relaxed = (
+                        np.minimum.accumulate((relaxed - backward[row])[::-1])[::-1]
+                        + backward[row]
+                    )
+                    if not changed and (relaxed < line).any():
+                        changed = True
+                    line[...] = relaxed
+                    previous = line
+            if not changed:
+                return
+
+    def _trace_back(self, costs) -> list[Position]:
+        position = self.grid.destination
+        path = [position]
+        boundary = self.grid.boundary
+        while position != self.grid.start:
+            cost = costs[position.x, position.y] - self.risks[position.x, position.y]
+            position = next(
+                neighbour
+                for neighbour in position.neighbours
+                if neighbour in boundary and costs[neighbour.x, neighbour.y] == cost
+            )
+            path.append(position)
+        return path[::-1]
+
+
+class LPAStar:
+    """Lifelong planning A*, which repairs the shortest path after changes."""
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.height = grid.destination.x + 1
+        self.width = grid.destination.y + 1
+        self.risks = [risk for row in grid.risks for risk in row]
+        self.target = len(self.risks) - 1
+        # g is the settled cost, rhs the one-step lookahead from the neighbours
+        self.g = [math.inf] * len(self.risks)
+        self.rhs = [math.inf] * len(self.risks)
+        self.rhs[0] = 0
+        self.expanded = 0
+        self._queue: list[tuple[tuple[float, float], int]] = []
+        self._queued: dict[int, tuple[float, float]] = {}
+        self._enqueue(0)
+
+    def solve(self) -> Graph:
+        self.expanded = 0
+        self._compute_shortest_path()
+        return Graph.from_positions(self.grid, self._trace_back())
+
+    def update(self, position: Position, risk: int) -> Graph:
+        """Change the risk of one cell and return the repaired shortest path."""
+        assert 1 <= risk <= 9
+        self.grid[position].value = risk
+        self.grid.risks[position.x][position.y] = risk
+        index = position.x * self.width + position.y
+        self.risks[index] = risk
+        # the risk is the cost of entering the cell, so only its own rhs changes
+        self._update_vertex(index)
+        return self.solve()
+
+    @property
+    def cost(self) -> float:
+        return self.g[self.target]
+
+    def _heuristic(self, index: int) -> int:
+        # every step costs at least 1
+        x, y = divmod(index, self.width)
+        return self.height - 1 - x + self.width - 1 - y
+
+    def _key(self, index: int) -> tuple[float, float]:
+        cost = min(self.g[index], self.rhs[index])
+        return cost + self._heuristic(index), cost
+
+    def _neighbours(self, index: int) -> list[int]:
+        x, y = divmod(index, self.width)
+        neighbours = []
+        if x > 0:
+            neighbours.append(index - self.width)
+        if x < self.height - 1:
+            neighbours.append(index + self.width)
+        if y > 0:
+            neighbours.append(index - 1)
+        if y < self.width - 1:
+            neighbours.append(index + 1)
+        return neighbours
+
+    def _enqueue(self, index: int):
+        key = self._key(index)
+        self._queued[index] = key
+        heapq.heappush(self._queue, (key, index))
+
+    def _top_key(self) -> tuple[float, float]:
+        # entries whose key was superseded are dropped lazily
+        while self._queue:
+            key, index = self._queue[0]
+            if self._queued.get(index) == key:
+                return key
+            heapq.heappop(self._queue)
+        return math.inf, math.inf
+
+    def _update_vertex(self, index: int):
+        if index != 0:
+            self.rhs[index] = (
+                min(self.g[neighbour] for neighbour in self._neighbours(index))
+                + self.risks[index]
+            )
+        if self.g[index] != self.rhs[index]:
+            self._enqueue(index)
+        else:
+            self._queued.pop(index, None)
+
+    def _compute_shortest_path(self):
+        target = self.target
+        while self._top_key() < self._key(target) or self.rhs[target] != self.g[target]:
+            if not self._queue:
+                raise ValueError("Destination is not reachable.")
+            _, index = heapq.heappop(self._queue)
+            del self._queued[index]
+            self.expanded += 1
+            if self.g[index] > self.rhs[index]:
+                self.g[index] = self.rhs[index]
+                for neighbour in self._neighbours(index):
+                    self._update_vertex(neighbour)
+            else:
+                self.g[index] = math.inf
+                for neighbour in self._neighbours(index) + [index]:
+                    self._update_vertex(neighbour)
+
+    def _trace_back(self) -> list[Position]:
+        index = self.target
+        path = [index]
+        while index != 0:
+            index = min(
+                self._neighbours(index), key=lambda neighbour: self.g[neighbour]
+            )
+            path.append(index)
+        return [Position(*divmod(index, self.width)) for index in reversed(path)]
+
+
+ENGINES = {"astar": AStar, "dial": Dial, "wavefront": Wavefront, "lpastar": LPAStar}
+
+
+def convert_to_binary(filename, binary_filename) -> tuple[int, int]:
+    """Write a text risk map as a uint8 ``.npy`` file, one row at a time."""
+    import numpy as np
+
+    with open(filename, "rb") as fd:
+        width = len(fd.readline().strip())
+        height = 1 + sum(1 for line in fd if line.strip())
+    risks = np.lib.format.open_memmap(
+        binary_filename, mode="w+", dtype=np.uint8, shape=(height, width)
+    )
+    with open(filename, "rb") as fd:
+        for row, line in enumerate(line for line in fd if line.strip()):
+            risks[row] = np.frombuffer(line.strip(), dtype=np.uint8) - ord("0")
+            assert 1 <= risks[row].min() and risks[row].max() <= 9
+    risks.flush()
+    return height, width
+
+
+class TiledSolver:
+    """Shortest path over a memory-mapped risk map, relaxed one tile at a time."""
+
+    def __init__(self, binary_filename, costs_filename=None, tile: int = 1024):
+        import numpy as np
+
+        self.risks = np.load(binary_filename, mmap_mode="r")
+        if costs_filename is None:
+            costs_filename = f"{binary_filename}.costs.npy"
+        self.costs = np.lib.format.open_memmap(
+            costs_filename, mode="w+", dtype=np.uint32, shape=self.risks.shape
+        )
+        self.tile = tile
+        self.height, self.width = self.risks.shape
+        self.tiles_processed = 0
+
+    def solve(self) -> Graph:
+        queue = [(0, 0, 0)]
+        active = {(0, 0)}
+        while queue:
+            _, tile_x, tile_y = heapq.heappop(queue)
+            if (tile_x, tile_y) not in active:
+                continue
+            active.remove((tile_x, tile_y))
+            start = self.tiles_processed == 0
+            for priority, neighbour in self._relax_tile(tile_x, tile_y, start=start):
+                active.add(neighbour)
+                heapq.heappush(queue, (priority, *neighbour))
+        self.costs.flush()
+        return self._trace_back()
+
+    @property
+    def cost(self) -> int:
+        return int(self.costs[-1, -1]) - 1
+
+    def _relax_tile(
+        self, tile_x: int, tile_y: int, start: bool = False
+    ) -> list[tuple[int, tuple]]:
+        """Relax one tile and return the neighbouring tiles to activate."""
+        import numpy as np
+
+        self.tiles_processed += 1
+        x0, y0 = tile_x * self.tile, tile_y * self.tile
+        x1, y1 = min(x0 + self.tile, self.height), min(y0 + self.tile, self.width)
+        # with the halo around the tile, clipped at the border of the map
+        hx0, hy0 = max(x0 - 1, 0), max(y0 - 1, 0)
+        hx1, hy1 = min(x1 + 1, self.height), min(y1 + 1, self.width)
+        inner = (slice(x0 - hx0, x1 - hx0), slice(y0 - hy0, y1 - hy0))
+
+        risks = np.asarray(self.risks[hx0:hx1, hy0:hy1], dtype=np.int64)
+        stored = np.asarray(self.costs[hx0:hx1, hy0:hy1], dtype=np.int64)
+        unreached = np.iinfo(np.int64).max // 2
+        # stored as cost + 1, so that the zeros of a fresh file mean unreached
+        costs = np.where(stored == 0, unreached, stored - 1)
+        before = costs[inner].copy()
+        if start:
+            costs[0, 0] = 0
+        Wavefront.relax(costs, risks)
+        after = costs[inner]
+        improved = after < before
+        self.costs[x0:x1, y0:y1] = np.where(after == unreached, 0, after + 1)
+
+        activate = []
+        edges = [
+            (improved[0, :], after[0, :], (tile_x - 1, tile_y)),
+            (improved[-1, :], after[-1, :], (tile_x + 1, tile_y)),
+            (improved[:, 0], after[:, 0], (tile_x, tile_y - 1)),
+            (improved[:, -1], after[:, -1], (tile_x, tile_y + 1)),
+        ]
+        for edge_improved, edge_costs, (neighbour_x, neighbour_y) in edges:
+            if not edge_improved.any():
+                continue
+            if not (0 <= neighbour_x * self.tile < self.height):
+                continue
+            if not (0 <= neighbour_y * self.tile < self.width):
+                continue
+            priority = int(edge_costs[edge_improved].min())
+            activate.append((priority, (neighbour_x, neighbour_y)))
+        return activate
+
+    def _trace_back(self) -> Graph:
+        position = Position(self.height - 1, self.width - 1)
+        boundary = Boundary(Position(0, 0), position)
+        path = [position]
+        while position != Position(0, 0):
+            neighbours = [n for n in position.neighbours if n in boundary]
+            position = min(neighbours, key=self._stored_cost)
+            path.append(position)
+        cells = [Cell(pos, int(self.risks[pos.x, pos.y])) for pos in reversed(path)]
+        return Graph(cells)
+
+    def _stored_cost(self, position: Position) -> float:
+        return int(self.costs[position.x, position.y]) or math.inf
 
 
 class Graph:
@@ -322,7 +713,7 @@ class Graph:
     def risk_up_to_index(self, idx: int | None = None) -> int:
         if idx is None:
             idx = len(self)
-        own_risk = sum([cell.value for cell in self.elements[:idx+1]])
+        own_risk = sum([cell.value for cell in self.elements[: idx + 1]])
 
         if self.extends_graph is None:
             return own_risk - self._start_cell_risk
@@ -342,6 +733,10 @@ class Graph:
     def from_grid(cls, grid: Grid) -> Graph:
         return cls([grid[grid.start]], extends_graph=None, at_idx=None)
 
+    @classmethod
+    def from_positions(cls, grid: Grid, positions: list[Position]) -> Graph:
+        return cls([grid[position] for position in positions])
+
     def can_extend_to_cell(self, cell: Cell) -> bool:
         return cell.position in self.last_cell.position.neighbours
 
@@ -369,6 +764,15 @@ class Graph:
             return Graph(own_elements, extends_graph=None, at_idx=None)
 
 
+def parse(content: str) -> Grid:
+    return Grid.from_str(content)
+
+
+def part_one(grid: Grid, engine: str = "dial") -> int:
+    # not astar, whose heuristic may overestimate and miss the cheapest path
+    return ENGINES[engine](grid).solve().risk
+
+
 def main():
     grid = Grid.from_file("testdata.txt")
     astar = AStar(grid)
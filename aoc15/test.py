@@ -1,5 +1,20 @@
+import random
+from pathlib import Path
+
 import pytest
-from aoc15 import Cell, Graph, Position
+from aoc15 import (
+    Cell,
+    Dial,
+    Graph,
+    Grid,
+    LPAStar,
+    Position,
+    TiledSolver,
+    Wavefront,
+    convert_to_binary,
+)
+
+TESTDATA = Path(__file__).with_name("testdata.txt")
 
 
 class TestGraph:
@@ -38,3 +53,84 @@ class TestPosition:
         assert Position(2, 0) not in pos.neighbours
         assert Position(2, 2) not in pos.neighbours
         assert Position(0, 2) not in pos.neighbours
+
+
+class TestEngines:
+    def test_dial(self):
+        grid = Grid.from_file(TESTDATA)
+        graph = Dial(grid).solve()
+        assert graph.risk == 40
+        assert graph[0].position == grid.start
+        assert graph[-1].position == grid.destination
+
+    def test_wavefront(self):
+        pytest.importorskip("numpy")
+        grid = Grid.from_file(TESTDATA)
+        graph = Wavefront(grid).solve()
+        assert graph.risk == 40
+        assert graph[0].position == grid.start
+        assert graph[-1].position == grid.destination
+
+    def test_detour(self):
+        # the cheapest route leaves the direct diagonal and comes back
+        grid = Grid.from_str("19111\n11191\n99991\n")
+        assert Dial(grid).solve().risk == 8
+
+
+class TestLPAStar:
+    @staticmethod
+    def random_grid(side: int, seed: int) -> Grid:
+        rng = random.Random(seed)
+        rows = [
+            "".join(str(rng.randint(1, 9)) for _ in range(side)) for _ in range(side)
+        ]
+        return Grid.from_str("\n".join(rows))
+
+    def test_solve(self):
+        assert LPAStar(Grid.from_file(TESTDATA)).solve().risk == 40
+
+    def test_update_matches_full_search(self):
+        grid = self.random_grid(20, seed=1)
+        planner = LPAStar(grid)
+        planner.solve()
+        rng = random.Random(2)
+        for _ in range(30):
+            position = Position(rng.randrange(20), rng.randrange(20))
+            if position == grid.start:
+                continue
+            graph = planner.update(position, rng.randint(1, 9))
+            assert graph.risk == planner.cost == Dial(grid).solve().risk
+
+    def test_update_is_local(self):
+        grid = self.random_grid(40, seed=3)
+        planner = LPAStar(grid)
+        planner.solve()
+        initial = planner.expanded
+        planner.update(grid.destination + Position(0, -1), 9)
+        assert planner.expanded < initial / 10
+
+
+class TestTiledSolver:
+    @pytest.mark.parametrize("tile", [1, 3, 4, 100])
+    def test_testdata(self, tmp_path, tile):
+        pytest.importorskip("numpy")
+        binary = tmp_path / "risks.npy"
+        assert convert_to_binary(TESTDATA, binary) == (10, 10)
+        solver = TiledSolver(binary, tile=tile)
+        graph = solver.solve()
+        assert graph.risk == solver.cost == 40
+        assert graph[-1].position == Position(9, 9)
+
+    def test_matches_dial(self, tmp_path):
+        pytest.importorskip("numpy")
+        text = tmp_path / "risks.txt"
+        rng = random.Random(4)
+        text.write_text(
+            "\n".join(
+                "".join(str(rng.randint(1, 9)) for _ in range(37)) for _ in range(23)
+            )
+        )
+        binary = tmp_path / "risks.npy"
+        convert_to_binary(text, binary)
+        expected = Dial(Grid.from_file(text)).solve().risk
+        assert TiledSolver(binary, tile=8).solve().risk == expected
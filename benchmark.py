@@ -0,0 +1,169 @@
+"""Benchmark every day across synthetic inputs of increasing size.
+
+    python benchmark.py --output bench.json
+    python benchmark.py 5 15 --baseline bench.json --threshold 20
+    python benchmark.py 15 --engine dial --engine wavefront
+
+Results are written as JSON, ``{day: {size: {phase: seconds}}}``, using the
+best of ``--repeat`` runs. The time to import each day in a fresh interpreter
+is recorded under the size ``"import"``. Days with several engines are run
+with each of them, or with those given by ``--engine``, and their phases are
+recorded as ``phase:engine``, e.g. ``part_one:dial``. Engines that are too
+slow for the sizes of their day get their own in ``ENGINE_SWEEPS``. With ``--baseline``, any
+phase that got more than ``--threshold`` percent slower than in the baseline
+is reported and the exit status is 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+
+from generators import GENERATORS
+from runner import ROOT, engines, run_day
+
+SWEEPS: dict[int, list[int]] = {
+    3: [100, 1000, 10000],
+    4: [10, 100, 1000],
+    5: [50, 500, 5000],
+    6: [10, 100, 300],
+    7: [100, 500, 1000],
+    8: [100, 1000, 10000],
+    12: [6, 10, 14],
+    15: [100, 300, 900],
+}
+
+# engines too slow for the sweep of their day
+ENGINE_SWEEPS: dict[int, dict[str, list[int]]] = {
+    15: {"astar": [5, 10, 20], "lpastar": [100, 200, 400]},
+}
+
+Results = dict[str, dict[str, dict[str, float]]]
+
+
+def sweep(day: int, engine: str | None) -> list[int]:
+    return ENGINE_SWEEPS.get(day, {}).get(engine, SWEEPS[day])
+
+
+def benchmark_day(
+    day: int, seed: int, repeat: int, day_engines: list[str | None] | None = None
+):
+    results: dict[str, dict[str, float]] = {}
+    for engine in day_engines or [None]:
+        for size in sweep(day, engine):
+            raw = GENERATORS[day](size, seed).encode()
+            best = results.setdefault(str(size), {})
+            for _ in range(repeat):
+                for measurement in run_day(
+                    day, raw, use_cache=False, trace_memory=False, engine=engine
+                ):
+                    phase = measurement.phase
+                    if engine is not None:
+                        phase = f"{phase}:{engine}"
+                    best[phase] = min(
+                        measurement.seconds, best.get(phase, float("inf"))
+                    )
+    return dict(sorted(results.items(), key=lambda item: int(item[0])))
+
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import runner
+runner.load_day({day})
+print(time.perf_counter() - start)
+"""
+
+
+def benchmark_import(day: int, repeat: int) -> float:
+    """Time importing the day module in a fresh interpreter.
+
+    The runner import is included, as it is part of every invocation.
+    """
+    return min(
+        float(
+            subprocess.run(
+                [sys.executable, "-c", IMPORT_SCRIPT.format(day=day)],
+                cwd=ROOT,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    )
+
+
+def find_regressions(
+    results: Results, baseline: Results, threshold: float
+) -> list[str]:
+    regressions = []
+    for day, sizes in results.items():
+        for size, phases in sizes.items():
+            for phase, seconds in phases.items():
+                try:
+                    before = baseline[day][size][phase]
+                except KeyError:
+                    continue
+                change = 100 * (seconds - before) / before
+                if change > threshold:
+                    regressions.append(
+                        f"day {day} size {size} {phase}: "
+                        f"{before * 1000:.2f} ms -> {seconds * 1000:.2f} ms "
+                        f"(+{change:.0f}%)"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, default=list(SWEEPS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent")
+    parser.add_argument(
+        "--engine", action="append", help="engines to run, default all of them"
+    )
+    args = parser.parse_args()
+
+    results: Results = {}
+    for day in args.days:
+        results[str(day)] = {
+            "import": {"import": benchmark_import(day, args.repeat)},
+            **benchmark_day(
+                day,
+                args.seed,
+                args.repeat,
+                [
+                    engine
+                    for engine in engines(day)
+                    if args.engine is None or engine in args.engine
+                ],
+            ),
+        }
+        for size, phases in results[str(day)].items():
+            timings = ", ".join(
+                f"{phase} {seconds * 1000:.2f} ms" for phase, seconds in phases.items()
+            )
+            print(f"day {day:>2} size {size:>6}: {timings}")
+
+    if args.output:
+        with open(args.output, "w") as fd:
+            json.dump(results, fd, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fd:
+            baseline = json.load(fd)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
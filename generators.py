@@ -0,0 +1,135 @@
+"""Seeded generators for synthetic puzzle inputs.
+
+Every generator takes a size and a seed and returns the input as text, in the
+same format as the ``data.txt`` of its day.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable
+
+# segments lit for each digit of a seven-segment display
+DIGIT_SEGMENTS = [
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+]
+
+
+def binary_report(rows: int, seed: int = 0, width: int = 12) -> str:
+    """Distinct rows, widened if ``width`` bits cannot hold enough of them."""
+    rng = random.Random(seed)
+    width = max(width, rows.bit_length() + 1)
+    return "\n".join(
+        format(value, f"0{width}b") for value in rng.sample(range(2**width), rows)
+    )
+
+
+def bingo(boards: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    draws = list(range(100))
+    rng.shuffle(draws)
+    blocks = [",".join(map(str, draws))]
+    for _ in range(boards):
+        numbers = rng.sample(range(100), 25)
+        rows = [numbers[i : i + 5] for i in range(0, 25, 5)]
+        blocks.append("\n".join(" ".join(f"{n:>2}" for n in row) for row in rows))
+    return "\n\n".join(blocks) + "\n"
+
+
+def vent_lines(lines: int, seed: int = 0, extent: int = 1000) -> str:
+    """Horizontal, vertical and diagonal lines inside ``extent`` x ``extent``."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(lines):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.randrange(3)
+        if kind == 0:
+            x2, y2 = rng.randrange(extent), y1
+        elif kind == 1:
+            x2, y2 = x1, rng.randrange(extent)
+        else:
+            dx, dy = rng.choice([-1, 1]), rng.choice([-1, 1])
+            limit_x = extent - 1 - x1 if dx > 0 else x1
+            limit_y = extent - 1 - y1 if dy > 0 else y1
+            length = rng.randint(0, min(limit_x, limit_y))
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        result.append(f"{x1},{y1} -> {x2},{y2}")
+    return "\n".join(result)
+
+
+def fish_timers(fish: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return ",".join(str(rng.randint(1, 5)) for _ in range(fish))
+
+
+def crab_positions(crabs: int, seed: int = 0, spread: int = 2000) -> str:
+    rng = random.Random(seed)
+    return ",".join(
+        str(int(rng.expovariate(3 / spread)) % spread) for _ in range(crabs)
+    )
+
+
+def display_patterns(entries: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(entries):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(segments: str) -> str:
+            wires = [wiring[segment] for segment in segments]
+            rng.shuffle(wires)
+            return "".join(wires)
+
+        patterns = [scramble(segments) for segments in DIGIT_SEGMENTS]
+        rng.shuffle(patterns)
+        outputs = [scramble(rng.choice(DIGIT_SEGMENTS)) for _ in range(4)]
+        result.append(f"{' '.join(patterns)} | {' '.join(outputs)}")
+    return "\n".join(result)
+
+
+def cave_system(small_caves: int, seed: int = 0) -> str:
+    """Small caves joined to each other and to large ones, never large to large."""
+    rng = random.Random(seed)
+    small = [f"s{i}" for i in range(small_caves)]
+    large = [f"L{i}" for i in range(max(1, small_caves // 3))]
+    # sorted, so that a connection is only listed once, in either direction
+    connections = {
+        tuple(sorted(("start", rng.choice(small)))),
+        tuple(sorted((rng.choice(small), "end"))),
+        tuple(sorted(("start", rng.choice(large)))),
+        tuple(sorted((rng.choice(large), "end"))),
+    }
+    for cave in small:
+        for _ in range(rng.randint(1, 3)):
+            other = rng.choice(small + large)
+            if other != cave:
+                connections.add(tuple(sorted((cave, other))))
+    return "\n".join(f"{cave1}-{cave2}" for cave1, cave2 in sorted(connections))
+
+
+def risk_grid(side: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    return "\n".join(
+        "".join(str(rng.randint(1, 9)) for _ in range(side)) for _ in range(side)
+    )
+
+
+GENERATORS: dict[int, Callable[..., str]] = {
+    3: binary_report,
+    4: bingo,
+    5: vent_lines,
+    6: fish_timers,
+    7: crab_positions,
+    8: display_patterns,
+    12: cave_system,
+    15: risk_grid,
+}
@@ -0,0 +1,142 @@
+"""Per-phase timing and allocation counts for the day solvers.
+
+Phases are named sections such as ``parse``, ``build`` and ``solve``. They
+can be marked explicitly::
+
+    profiler = Profiler()
+    with profiler.session():
+        with profiler.phase("parse"):
+            ...
+
+or a day module can list the functions belonging to each phase in a
+``PHASES`` dict, e.g. ``{"solve": ["AStar.solve"]}``, and ``instrument``
+wraps them for the duration of a ``with`` block. Nothing is patched outside
+of it, so the day modules do not depend on this one.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Iterator
+
+
+@dataclass
+class PhaseStats:
+    phase: str
+    calls: int = 0
+    # including nested phases
+    seconds: float = 0.0
+    # excluding nested phases
+    self_seconds: float = 0.0
+    # net growth of traced memory, 0 outside of a session
+    allocated_bytes: int = 0
+    # highest traced memory of any call above what was traced when it started
+    peak_bytes: int = 0
+
+
+@dataclass
+class _Frame:
+    # seconds spent in nested phases
+    nested: float = 0.0
+    # highest traced memory before the latest nested phase reset the peak
+    peak: int = 0
+
+
+class Profiler:
+    def __init__(self, cprofile: bool = False):
+        self.phases: dict[str, PhaseStats] = {}
+        self.cprofile = cProfile.Profile() if cprofile else None
+        # one frame per open phase
+        self._stack: list[_Frame] = []
+
+    @contextmanager
+    def session(self) -> Iterator[Profiler]:
+        """Trace allocations, and run cProfile if enabled, inside the block."""
+        tracemalloc.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        try:
+            yield self
+        finally:
+            if self.cprofile is not None:
+                self.cprofile.disable()
+            tracemalloc.stop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+        memory = 0
+        if tracing:
+            memory, peak = tracemalloc.get_traced_memory()
+            # the peak is reset for this phase, so the enclosing phase keeps
+            # what it has seen so far
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+        frame = _Frame()
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1].nested += seconds
+            stats = self.phases.setdefault(name, PhaseStats(name))
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.self_seconds += seconds - frame.nested
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                stats.allocated_bytes += current - memory
+                stats.peak_bytes = max(stats.peak_bytes, max(frame.peak, peak) - memory)
+
+    def wrap(self, name: str, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    @contextmanager
+    def instrument(
+        self, module: ModuleType, phases: dict[str, list[str]]
+    ) -> Iterator[None]:
+        """Wrap the listed functions of the module, e.g. ``"Grid.from_lines"``."""
+        with ExitStack() as stack:
+            for name, paths in phases.items():
+                for path in paths:
+                    stack.enter_context(self._patch(module, path, name))
+            yield
+
+    @contextmanager
+    def _patch(self, module: ModuleType, path: str, name: str) -> Iterator[None]:
+        *owners, attribute = path.split(".")
+        owner = module
+        for owner_name in owners:
+            owner = getattr(owner, owner_name)
+        original = vars(owner)[attribute]
+        if isinstance(original, (staticmethod, classmethod)):
+            patched = type(original)(self.wrap(name, original.__func__))
+        else:
+            patched = self.wrap(name, original)
+        setattr(owner, attribute, patched)
+        try:
+            yield
+        finally:
+            setattr(owner, attribute, original)
+
+    def records(self) -> list[dict]:
+        return [asdict(stats) for stats in self.phases.values()]
+
+    def dump_stats(self, filename) -> None:
+        assert self.cprofile is not None
+        self.cprofile.dump_stats(filename)
@@ -0,0 +1,396 @@
+"""Run the daily puzzles from one place.
+
+    python runner.py                           # every day on its default input
+    python runner.py 5 7                       # selected days only
+    python runner.py 15 --input aoc15/testdata.txt
+    python runner.py --batch 5:aoc05/data.txt '15:maps/*.txt' --output out.jsonl
+    python runner.py 4 15 --profile --cprofile profiles/
+    python runner.py 3 15 --engine numpy
+
+Each day module exposes ``parse(content)`` plus ``part_one`` and/or
+``part_two``, which take the parsed input and return the answer. Modules are
+imported only when their day is run. Parsed inputs are pickled into
+``.cache/``, keyed by the SHA-256 of the day's source and the raw input, so
+repeated runs skip parsing. Days whose parsed input loads slower from a
+pickle than it parses set ``CACHE = False`` and are always parsed.
+
+Days with several engines list them in ``ENGINES``, and ``--engine`` is
+passed to their ``parse`` and parts wherever they take an ``engine``
+argument. Days that do not offer the requested engine run with their
+default.
+
+In batch mode, every ``DAY:PATH`` job runs in a process pool, largest input
+first, and each result is written as a JSON line as soon as its job is done.
+Workers only receive the day and the path and parse the input themselves (or
+load it from the cache), so no parsed input is pickled between processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext, redirect_stdout
+from functools import partial
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, TextIO, Union
+
+ROOT = Path(__file__).resolve().parent
+CACHE_DIR = ROOT / ".cache"
+DAYS = [3, 4, 5, 6, 7, 8, 12, 15]
+PARTS = ["part_one", "part_two"]
+
+Source = Union[str, os.PathLike, bytes]
+
+
+@dataclass
+class Measurement:
+    day: int
+    phase: str
+    answer: Any
+    seconds: float
+    peak_bytes: int
+
+    def __repr__(self):
+        answer = "" if self.answer is None else self.answer
+        return (
+            f"day {self.day:>2} {self.phase:<8} {self.seconds * 1000:>10.2f} ms "
+            f"{self.peak_bytes / 1024:>10.1f} KiB  {answer}"
+        )
+
+
+def module_name(day: int) -> str:
+    return f"aoc{day:02}"
+
+
+def day_directory(day: int) -> Path:
+    return ROOT / module_name(day)
+
+
+def load_day(day: int) -> ModuleType:
+    name = module_name(day)
+    if name in sys.modules:
+        return sys.modules[name]
+    path = day_directory(day) / f"{name}.py"
+    if not path.exists():
+        raise ValueError(f"There is no solver for day {day}.")
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # registered before execution, so pickle can resolve the day's classes
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def default_input(day: int) -> Path:
+    for filename in ["data.txt", "testdata.txt", "example.txt"]:
+        path = day_directory(day) / filename
+        if path.exists():
+            return path
+    raise FileNotFoundError(f"No input file found for day {day}.")
+
+
+def engines(day: int) -> list[str]:
+    return list(getattr(load_day(day), "ENGINES", []))
+
+
+def with_engine(function: Callable, engine: str | None) -> Callable:
+    """Bind the engine if given and if the function takes one."""
+    if engine is None or "engine" not in inspect.signature(function).parameters:
+        return function
+    return partial(function, engine=engine)
+
+
+def check_engine(day: int, engine: str | None) -> None:
+    if engine is not None and engine not in engines(day):
+        raise ValueError(f"Day {day} has no engine {engine!r}.")
+
+
+def read_input(source: Source) -> bytes:
+    if isinstance(source, bytes):
+        return source
+    with open(source, "rb") as fd:
+        return fd.read()
+
+
+def cache_path(day: int, raw: bytes, engine: str | None = None) -> Path:
+    # the solver's source is part of the key, since a changed parser makes
+    # every cached input stale
+    source = Path(load_day(day).__file__).read_bytes()
+    key = source + b"\0" + raw
+    if engine is not None:
+        key += b"\0" + engine.encode()
+    digest = hashlib.sha256(key).hexdigest()
+    return CACHE_DIR / f"{module_name(day)}-{digest[:16]}.pickle"
+
+
+def input_cache_path(day: int, raw: bytes, engine: str | None) -> Path | None:
+    """Where the parsed input is cached, or None if the day is not cached."""
+    module = load_day(day)
+    if not getattr(module, "CACHE", True):
+        return None
+    # only an engine that changes the parsed input is part of the key
+    if with_engine(module.parse, engine) is module.parse:
+        engine = None
+    return cache_path(day, raw, engine)
+
+
+def parse_cached(
+    day: int, raw: bytes, use_cache: bool = True, engine: str | None = None
+) -> tuple[Any, bool]:
+    """Return the parsed input and whether it came from the cache."""
+    path = input_cache_path(day, raw, engine) if use_cache else None
+    if path is not None and path.exists():
+        return pickle.loads(path.read_bytes()), True
+    return with_engine(load_day(day).parse, engine)(raw.decode()), False
+
+
+def store_cached(day: int, raw: bytes, data: Any, engine: str | None = None) -> None:
+    path = input_cache_path(day, raw, engine)
+    if path is None:
+        return
+    CACHE_DIR.mkdir(exist_ok=True)
+    # batch workers may parse the same input concurrently
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    temporary.write_bytes(pickle.dumps(data))
+    os.replace(temporary, path)
+
+
+def measure(
+    function: Callable, *args, trace_memory: bool = True
+) -> tuple[Any, float, int]:
+    """Call the function and return its result, wall time and peak memory.
+
+    Tracing memory slows the call down, so timings taken with
+    ``trace_memory=False`` are the ones to compare; peak memory is 0 then.
+    """
+    if not trace_memory:
+        start = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - start, 0
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_day(
+    day: int,
+    source: Source | None = None,
+    *,
+    use_cache: bool = True,
+    quiet: bool = True,
+    trace_memory: bool = True,
+    engine: str | None = None,
+) -> list[Measurement]:
+    """Parse the input of a day and solve all of its parts.
+
+    Every part parses the input, or loads it from the cache, on its own, since
+    some solvers consume their input (e.g. the draws in day 4). Each of these
+    is measured as a ``parse`` phase; writing the cache is not measured.
+    """
+    module = load_day(day)
+    check_engine(day, engine)
+    raw = read_input(default_input(day) if source is None else source)
+    results = []
+    with open(os.devnull, "w") as devnull:
+        with redirect_stdout(devnull) if quiet else nullcontext():
+            for part in PARTS:
+                if not hasattr(module, part):
+                    continue
+                (data, cached), seconds, peak = measure(
+                    parse_cached, day, raw, use_cache, engine, trace_memory=trace_memory
+                )
+                results.append(
+                    Measurement(
+                        day, "parse", "cached" if cached else None, seconds, peak
+                    )
+                )
+                if use_cache and not cached:
+                    store_cached(day, raw, data, engine)
+                answer, seconds, peak = measure(
+                    with_engine(getattr(module, part), engine),
+                    data,
+                    trace_memory=trace_memory,
+                )
+                results.append(Measurement(day, part, answer, seconds, peak))
+    return results
+
+
+def profile_day(
+    day: int,
+    source: Source | None = None,
+    *,
+    quiet: bool = True,
+    cprofile: str | None = None,
+    engine: str | None = None,
+) -> list[dict]:
+    """Run a day with its phases instrumented and return one record per phase.
+
+    The cache is bypassed, so that parsing is profiled as well. With
+    ``cprofile``, the cProfile stats are written to that file.
+    """
+    from profiling import Profiler
+
+    module = load_day(day)
+    check_engine(day, engine)
+    raw = read_input(default_input(day) if source is None else source)
+    profiler = Profiler(cprofile=cprofile is not None)
+    with open(os.devnull, "w") as devnull:
+        with redirect_stdout(devnull) if quiet else nullcontext():
+            with profiler.session(), profiler.instrument(
+                module, getattr(module, "PHASES", {})
+            ):
+                parse = with_engine(module.parse, engine)
+                for part in PARTS:
+                    if not hasattr(module, part):
+                        continue
+                    data = parse(raw.decode())
+                    with profiler.phase(part):
+                        with_engine(getattr(module, part), engine)(data)
+    if cprofile is not None:
+        profiler.dump_stats(cprofile)
+    return [{"day": day, **record} for record in profiler.records()]
+
+
+def parse_job(spec: str) -> list[tuple[int, str]]:
+    day, _, pattern = spec.partition(":")
+    paths = sorted(glob.glob(pattern))
+    if not day.isdigit() or not paths:
+        raise ValueError(f"Invalid job {spec!r}, expected DAY:PATH.")
+    return [(int(day), path) for path in paths]
+
+
+def _run_job(
+    day: int, path: str, use_cache: bool, engine: str | None = None
+) -> list[dict]:
+    try:
+        results = run_day(day, path, use_cache=use_cache, engine=engine)
+    except Exception as error:
+        return [{"day": day, "input": path, "error": repr(error)}]
+    return [{"input": path, "engine": engine, **asdict(result)} for result in results]
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars, e.g. the answer of day 4
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def run_batch(
+    jobs: list[tuple[int, str]],
+    output: TextIO,
+    *,
+    workers: int | None = None,
+    use_cache: bool = True,
+    engine: str | None = None,
+) -> None:
+    """Run the jobs, passing the engine to the days that offer it."""
+    # the process pool machinery is slow to import and only needed here
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    jobs = sorted(jobs, key=lambda job: os.path.getsize(job[1]), reverse=True)
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [
+            executor.submit(_run_job, day, path, use_cache, day_engine(day, engine))
+            for day, path in jobs
+        ]
+        for future in as_completed(futures):
+            for record in future.result():
+                output.write(json.dumps(record, default=_json_default) + "\n")
+            output.flush()
+
+
+def day_engine(day: int, engine: str | None) -> str | None:
+    return engine if engine in engines(day) else None
+
+
+def check_engines(parser, days, engine: str | None) -> None:
+    if engine is not None and not any(engine in engines(day) for day in days):
+        parser.error(f"none of the selected days has the engine {engine!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--input", help="input file, only valid for a single day")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="show solver output")
+    parser.add_argument("--batch", nargs="+", metavar="DAY:PATH", help="batch jobs")
+    parser.add_argument("--workers", type=int, help="processes for batch mode")
+    parser.add_argument("--output", help="JSON lines file for batch mode")
+    parser.add_argument("--profile", action="store_true", help="time each phase")
+    parser.add_argument("--cprofile", metavar="DIR", help="write cProfile stats")
+    parser.add_argument("--engine", help="solver engine, for the days that offer it")
+    args = parser.parse_args()
+
+    if args.input and len(args.days) != 1:
+        parser.error("--input requires exactly one day")
+
+    if args.batch:
+        try:
+            jobs = [job for spec in args.batch for job in parse_job(spec)]
+        except ValueError as error:
+            parser.error(str(error))
+        check_engines(parser, {day for day, _ in jobs}, args.engine)
+        with (
+            open(args.output, "w") if args.output else nullcontext(sys.stdout)
+        ) as output:
+            run_batch(
+                jobs,
+                output,
+                workers=args.workers,
+                use_cache=not args.no_cache,
+                engine=args.engine,
+            )
+        return
+
+    check_engines(parser, args.days, args.engine)
+
+    if args.profile or args.cprofile:
+        if args.cprofile:
+            os.makedirs(args.cprofile, exist_ok=True)
+        for day in args.days:
+            cprofile = None
+            if args.cprofile:
+                cprofile = os.path.join(args.cprofile, f"{module_name(day)}.prof")
+            for record in profile_day(
+                day,
+                args.input,
+                quiet=not args.verbose,
+                cprofile=cprofile,
+                engine=day_engine(day, args.engine),
+            ):
+                print(json.dumps(record))
+        return
+
+    for day in args.days:
+        for result in run_day(
+            day,
+            args.input,
+            use_cache=not args.no_cache,
+            quiet=not args.verbose,
+            engine=day_engine(day, args.engine),
+        ):
+            print(result)
+
+
+if __name__ == "__main__":
+    main()
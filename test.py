@@ -0,0 +1,145 @@
+import time
+
+import pytest
+import runner
+from profiling import Profiler
+from runner import ROOT, cache_path, load_day, run_day, with_engine
+
+DAY_4 = ROOT / "aoc04" / "testdata.txt"
+DAY_15 = ROOT / "aoc15" / "testdata.txt"
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(runner, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+def answers(measurements) -> dict:
+    return {m.phase: m.answer for m in measurements if m.phase != "parse"}
+
+
+class TestRunner:
+    def test_cache_key(self):
+        raw = DAY_4.read_bytes()
+        assert cache_path(4, raw) == cache_path(4, raw)
+        assert cache_path(4, raw) != cache_path(4, raw + b"\n")
+        assert cache_path(4, raw) != cache_path(4, raw, "numpy")
+        assert cache_path(4, raw) != cache_path(5, raw)
+
+    def test_cache_hit(self, cache_dir):
+        first = run_day(4, DAY_4)
+        second = run_day(4, DAY_4)
+        assert [m.answer for m in first if m.phase == "parse"] == [None]
+        assert [m.answer for m in second if m.phase == "parse"] == ["cached"]
+        assert answers(first) == answers(second) == {"part_two": 2752}
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_no_cache(self, cache_dir):
+        run_day(4, DAY_4, use_cache=False)
+        assert not list(cache_dir.iterdir())
+
+    def test_day_without_cache(self, cache_dir):
+        for _ in range(2):
+            measurements = run_day(15, DAY_15)
+            assert [m.answer for m in measurements if m.phase == "parse"] == [None]
+        assert not list(cache_dir.iterdir())
+
+    def test_bytes_input(self, cache_dir):
+        assert answers(run_day(15, DAY_15.read_bytes())) == {"part_one": 40}
+
+    def test_engines(self, cache_dir):
+        pytest.importorskip("numpy")
+        for engine in ["dial", "wavefront", "lpastar"]:
+            assert answers(run_day(15, DAY_15, engine=engine)) == {"part_one": 40}
+        # the engine changes the parsed boards of day 4, so it is cached apart
+        run_day(4, DAY_4)
+        assert answers(run_day(4, DAY_4, engine="numpy")) == {"part_two": 2752}
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_missing_engine(self):
+        with pytest.raises(ValueError):
+            run_day(15, DAY_15, engine="numpy")
+        with pytest.raises(ValueError):
+            run_day(12, engine="dial")
+
+    def test_with_engine(self):
+        def solve(data, engine="python"):
+            return engine
+
+        def parse(data):
+            return data
+
+        assert with_engine(solve, None)(1) == "python"
+        assert with_engine(solve, "numpy")(1) == "numpy"
+        assert with_engine(parse, "numpy") is parse
+
+
+MEGABYTE = 1 << 20
+
+
+class TestProfiler:
+    def test_self_seconds(self):
+        profiler = Profiler()
+        with profiler.phase("outer"):
+            time.sleep(0.02)
+            with profiler.phase("inner"):
+                time.sleep(0.05)
+        outer, inner = profiler.phases["outer"], profiler.phases["inner"]
+        assert inner.seconds >= 0.05
+        assert outer.seconds >= outer.self_seconds + inner.seconds - 1e-9
+        assert 0.02 <= outer.self_seconds < 0.05
+        assert inner.self_seconds == inner.seconds
+
+    def test_peak_bytes(self):
+        profiler = Profiler()
+        with profiler.session():
+            with profiler.phase("parent"):
+                data = bytearray(10 * MEGABYTE)
+                del data
+                # resets the peak, which must not hide the parent's
+                with profiler.phase("child"):
+                    data = bytearray(MEGABYTE)
+                    del data
+            with profiler.phase("other parent"):
+                with profiler.phase("child"):
+                    data = bytearray(3 * MEGABYTE)
+                    del data
+        phases = profiler.phases
+        assert 10 * MEGABYTE <= phases["parent"].peak_bytes < 11 * MEGABYTE
+        assert 3 * MEGABYTE <= phases["other parent"].peak_bytes < 4 * MEGABYTE
+        assert 3 * MEGABYTE <= phases["child"].peak_bytes < 4 * MEGABYTE
+        assert phases["child"].calls == 2
+        assert abs(phases["parent"].allocated_bytes) < MEGABYTE
+
+    def test_outside_of_session(self):
+        profiler = Profiler()
+        with profiler.phase("phase"):
+            data = bytearray(MEGABYTE)
+        assert profiler.phases["phase"].peak_bytes == 0
+        assert profiler.phases["phase"].allocated_bytes == 0
+        del data
+
+    def test_instrument(self):
+        aoc08 = load_day(8)
+        Decoder, Segment = aoc08.Decoder, aoc08.Segment
+        originals = dict(vars(Decoder)), dict(vars(Segment))
+        signals = "be cfbegad cbdgef fgaecd cgeb fdcge agebfd fecdb fabcd edb"
+        patterns = [aoc08.Pattern(item) for item in signals.split()]
+        profiler = Profiler()
+        with profiler.instrument(
+            aoc08,
+            {
+                "static": ["Decoder.count_digits_appear_in_string"],
+                "class": ["Segment.find"],
+            },
+        ):
+            assert isinstance(
+                vars(Decoder)["count_digits_appear_in_string"], staticmethod
+            )
+            assert isinstance(vars(Segment)["find"], classmethod)
+            assert Decoder.count_digits_appear_in_string(patterns) == 4
+            assert Segment.find(Segment.b.value) is Segment.b
+        assert profiler.phases["static"].calls == 1
+        assert profiler.phases["class"].calls == 1
+        assert (dict(vars(Decoder)), dict(vars(Segment))) == originals